@@ -1,12 +1,9 @@
-import requests
 import urllib3
 import logging
+import orjson
+import time
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+from utils import *
 
 logger = logging.getLogger("ai")
 
@@ -15,6 +12,12 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class Ai:
     """Class for communicating with the AI component via a REST API."""
 
+    # The KPI values (per slice and direction) that the cached allocations are keyed on
+    KPI_NAMES = ("throughput", "latency", "jitter", "packetLoss")
+
+    # The maximum number of cached allocations
+    CACHE_MAX_ENTRIES = 128
+
     def __init__(self, config):
         """
         Initialize an Ai instance.
@@ -23,6 +26,32 @@ class Ai:
             config (dict): The main configuration.
         """
         self.config = config
+        self.session = createSession()
+        self._cache = {}
+
+    def close(self):
+        """
+        Close the HTTP session, release all pooled connections, and clear cached allocations.
+        """
+        self.session.close()
+        self._cache.clear()
+
+    def getCacheKey(self, kpis):
+        """
+        Construct a cache key from the measured KPIs, with numeric values rounded to one decimal.
+
+        Args:
+            kpis (list): Measured KPIs for each slice.
+
+        Returns:
+            tuple: The DL/UL KPI values of all slices.
+        """
+        return tuple(
+            round(value, 1) if isinstance(value, (int, float)) else value
+            for item in kpis
+            for direction in ("downlink", "uplink")
+            for value in (item[direction][name] for name in self.KPI_NAMES)
+        )
 
     def processKpis(self, kpis):
         """
@@ -37,26 +66,44 @@ class Ai:
         Returns:
             dict: DL/UL allocation response from the AI component.
         """
+        # Reuse a recent allocation if the KPIs have not changed
+        key = self.getCacheKey(kpis)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+
+        if cached != None and now - cached[0] < self.config.get("aiCacheTtlSeconds", 2.0):
+            logger.debug("Using cached AI/ML response: %s", cached[1])
+            return cached[1]
+
         aiParams = {
             "kpis": kpis
         }
 
-        logger.debug(f"Sending KPIs for AI/ML to process: {kpis}")
+        logger.debug("Sending KPIs for AI/ML to process: %s", kpis)
 
-        resp = requests.post(f"{self.config["aiBaseUrl"]}/allocate_resource", json=aiParams)
+        resp = self.session.post(f"{self.config["aiBaseUrl"]}/allocate_resource", data=orjson.dumps(aiParams), headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Could not get allocation from AI/ML; StatusCode={resp.status_code}")
             raise Exception("Getting allocation from AI/ML failed")
 
-        respJson = resp.json()
+        respJson = orjson.loads(resp.content)
+
+        logger.debug("AI/ML response: %s", respJson)
 
-        logger.debug(f"AI/ML response: {respJson}")
+        # Re-insert to keep the cache ordered from oldest to newest and evict the oldest entry
+        self._cache.pop(key, None)
+        self._cache[key] = (now, respJson)
+
+        if len(self._cache) > self.CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
 
         return respJson
 
 # For testing purposes
 if __name__ == "__main__":
+    configureLogging()
+
     ai = Ai({
         "aiBaseUrl": "http://172.29.6.15:5000"
     })
@@ -1,18 +1,12 @@
 from pathlib import Path
-import requests
 import logging
 import urllib3
-import json
+import orjson
+import copy
 import time
 
 from utils import *
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-
 logger = logging.getLogger("cumucore")
 
 currentDir = Path(__file__).parent
@@ -32,18 +26,21 @@ class Cumucore:
         """
         self.config = config
 
-    def sliceExists(self, slices, sliceName):
-        """
-        Check whether a slice exists in a slice list.
+        # Parse the Cumucore REST API request payload template only once
+        self._sliceTemplate = readJson(sliceConfFile)
 
-        Args:
-            slices (list): List of existing slices in Cumucore.
-            sliceName (str): Name of the slice to search for in the list.
+        # The configured slices do not change, so serialize their request payloads only once
+        self._slicePayloads = {item["id"]: self.getSlicePayload(item) for item in self.config["slices"]}
 
-        Returns:
-            bool: True if the slice exists in the submitted list.
+        # Cumucore uses a self-signed certificate
+        self.session = createSession()
+        self.session.verify = False
+
+    def close(self):
+        """
+        Close the HTTP session and release all pooled connections.
         """
-        return (next((item for item in slices if item["sliceName"] == sliceName), None) != None)
+        self.session.close()
 
     def deleteSlice(self, sliceName):
         """
@@ -55,9 +52,9 @@ class Cumucore:
         Raises:
             Exception: If deleting the slice fails.
         """
-        logger.debug(f"Deleting existing Cumucore slice '{sliceName}'")
+        logger.debug("Deleting existing Cumucore slice '%s'", sliceName)
 
-        resp = requests.delete(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance/" + sliceName, verify=False)
+        resp = self.session.delete(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance/" + sliceName, timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             raise Exception("Deleting Cumucore slice failed!")
@@ -71,41 +68,64 @@ class Cumucore:
         """
         logger.debug("Retrieving all existing Cumucore slices")
 
-        resp = requests.get(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance", verify=False)
+        resp = self.session.get(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance", timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             raise Exception("Retrieving existing Cumucore slices failed!")
 
-        existingSlices = json.loads(resp.text)["Data"]
+        existingSlices = {item["sliceName"] for item in orjson.loads(resp.content)["Data"]}
 
-        # Delete all existing (configured) slices
-        for item in self.config["slices"]:
-            if self.sliceExists(existingSlices, item["id"]):
-                self.deleteSlice(item["id"])
+        # Delete all existing (configured) slices concurrently
+        runConcurrently(self.deleteSlice, [
+            item["id"] for item in self.config["slices"] if item["id"] in existingSlices
+        ])
 
-    def createSlices(self):
+    def getSlicePayload(self, item):
+        """
+        Construct and serialize the REST API request payload for creating a slice.
+
+        Args:
+            item (dict): The slice configuration (slice name and S-NSSAI list).
+
+        Returns:
+            bytes: The JSON-encoded request payload.
+        """
+        # Deep copy as we modify nested dictionaries of the template
+        template = copy.deepcopy(self._sliceTemplate)
+
+        template["sliceName"] = item["id"]
+        template["serviceProfile"]["sNSSAIList"] = item["sNSSAIList"]
+        template["networkSliceSubnet"]["sliceProfile"]["sNSSAIList"] = item["sNSSAIList"]
+
+        return orjson.dumps(template)
+
+    def createSlice(self, item):
         """
-        Create all configured slices in Cumucore via a REST API call.
+        Create a single configured slice in Cumucore via a REST API call.
+
+        Args:
+            item (dict): The slice configuration (slice name and S-NSSAI list).
 
         Raises:
-            Exception: If creating slices in Cumucore fails.
+            Exception: If creating the slice in Cumucore fails.
         """
-        logger.debug("Creating Cumucore slices")
+        logger.debug("Creating Cumucore slice '%s'; SST=%s", item["id"], item["sNSSAIList"])
 
-        # Get the Cumucore REST API request payload template
-        template = json.loads(readFileContents(sliceConfFile))
+        resp = self.session.post(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance", data=self._slicePayloads[item["id"]], headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
 
-        for item in self.config["slices"]:
-            template["sliceName"] = item["id"]
-            template["serviceProfile"]["sNSSAIList"] = item["sNSSAIList"]
-            template["networkSliceSubnet"]["sliceProfile"]["sNSSAIList"] = item["sNSSAIList"]
+        if resp.status_code != 200:
+            raise Exception(f"Creating Cumucore slice '{item["id"]}' failed!")
 
-            logger.debug(f"Creating Cumucore slice '{item["id"]}'; SST={item["sNSSAIList"]}")
+    def createSlices(self):
+        """
+        Create all configured slices in Cumucore concurrently.
 
-            resp = requests.post(f"{self.config["cumucoreBaseUrl"]}/api/v1.0/network-slice/slice-instance", json=template, verify=False)
+        Raises:
+            Exception: If creating slices in Cumucore fails.
+        """
+        logger.debug("Creating Cumucore slices")
 
-            if resp.status_code != 200:
-                raise Exception(f"Creating Cumucore slice '{item["id"]}' failed!")
+        runConcurrently(self.createSlice, self.config["slices"])
 
     def initialize(self):
         """
@@ -125,6 +145,8 @@ class Cumucore:
 
 # For testing purposes
 if __name__ == "__main__":
+    configureLogging()
+
     cumucore = Cumucore({
         "defaultSliceId": "b84725bc-955a-44bb-9327-21c9d7eb5f65",
         "slices": [
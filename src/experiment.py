@@ -1,10 +1,10 @@
 from datetime import datetime, timezone
 from pathlib import Path
+import collections
 import threading
 import logging
 import time
 import json
-import copy
 
 from utils import *
 from cumucore import Cumucore
@@ -29,26 +29,31 @@ class Experiment:
     STATE_DONE = "done"
     STATE_ERROR = "error"
 
+    # Maximum time (in seconds) to wait for the experiment thread to stop
+    JOIN_TIMEOUT_SECONDS = 60
+
     def __init__(self):
         """
         Initialize an Experiment instance.
         """
         self.runningLock = threading.Lock()
         self.statusLock = threading.Lock()
+        self.logLock = threading.Lock()
         self._thread = None
         self._stop_event = threading.Event()
-        self.id = None
-        self.state = self.STATE_READY
-        self.message = None
-        self.log = ""
+        # Status (ID, state, message) is replaced as a whole, so it can be read without locking
+        self._status = (None, self.STATE_READY, None)
+        self.log = collections.deque()
         self.nst = None
         self.startTime = None
         self.stopTime = None
+        self._startDeadline = None
+        self._stopDeadline = None
         self.slices = []
         self.apps = []
 
         # Load contents from the main configuration file
-        self.config = json.loads(readFileContents(mainConfFile))
+        self.config = readJson(mainConfFile)
 
         # Create all the sub-modules
         self.qosium = Qosium(self.config)
@@ -74,6 +79,13 @@ class Experiment:
         except Exception as e:
             pass
 
+        # Release pooled REST API connections between experiments
+        self.qosium.close()
+        self.ai.close()
+        self.cumucore.close()
+        self.osm.close()
+        self.ovs.close()
+
     def init(self):
         """
         Initialize all sub-modules for experiment execution.
@@ -87,6 +99,9 @@ class Experiment:
         #self.osm.initialize(self.apps)
         self.qosium.initialize(self.slices)
 
+        # OvS may have been changed since the previous experiment; always send the initial values
+        self.ovs.forceNextUpdate()
+
         # Set DL/UL rate and burst values to zero in OvS (no limit)
         self.ovs.setDownlinkUplinkValues([
             #{"dl": {"rate": 400000, "burst": 75000}, "ul": {"rate": 60000, "burst": 11250}},
@@ -101,47 +116,47 @@ class Experiment:
         """
         Execution loop of an experiment with AI-adjusted resource allocation.
         """
-        while not self._stop_event.is_set():
-            if datetime.now(timezone.utc) >= self.startTime:
-                self.setStatus(self.STATE_EXECUTE, None)
+        # Wait for the start time; return if the experiment is stopped before it
+        if self._stop_event.wait(max(0, self._startDeadline - time.monotonic())):
+            return
 
-                while datetime.now(timezone.utc) < self.stopTime and not self._stop_event.is_set():
-                    try:
-                        # If we have 2 slices, use AI-based resource allocation
-                        if len(self.slices) == 2:
-                            kpis = self.qosium.getKpisPerSlice()
+        self.setStatus(self.STATE_EXECUTE, None)
 
-                            self.setLog(f"Got KPIs from Qosium: {json.dumps(kpis)}")
+        while time.monotonic() < self._stopDeadline:
+            try:
+                # If we have 2 slices, use AI-based resource allocation
+                if len(self.slices) == 2:
+                    kpis = self.qosium.getKpisPerSlice()
 
-                            # Get allocation for downlink and uplink
+                    self.setLog(f"Got KPIs from Qosium: {json.dumps(kpis)}")
 
-                            allocation = self.ai.processKpis(kpis)
+                    # Get allocation for downlink and uplink
 
-                            dlSlice1 = allocation["downlink_allocation"]["slice1"]
-                            dlSlice2 = allocation["downlink_allocation"]["slice2"]
-                            ulSlice1 = allocation["uplink_allocation"]["slice1"]
-                            ulSlice2 = allocation["uplink_allocation"]["slice2"]
+                    allocation = self.ai.processKpis(kpis)
 
-                            logger.debug(f"Got DL slice allocation; Slice1={dlSlice1}, Slice2={dlSlice2}")
-                            logger.debug(f"Got UL slice allocation; Slice1={ulSlice1}, Slice2={ulSlice2}")
+                    dlSlice1 = allocation["downlink_allocation"]["slice1"]
+                    dlSlice2 = allocation["downlink_allocation"]["slice2"]
+                    ulSlice1 = allocation["uplink_allocation"]["slice1"]
+                    ulSlice2 = allocation["uplink_allocation"]["slice2"]
 
-                            #"""
-                            self.adjustSwitchValues(dlSlice1, dlSlice2, ulSlice1, ulSlice2)
+                    logger.debug("Got DL slice allocation; Slice1=%s, Slice2=%s", dlSlice1, dlSlice2)
+                    logger.debug("Got UL slice allocation; Slice1=%s, Slice2=%s", ulSlice1, ulSlice2)
 
-                            epoch_ms_now = time.time_ns() // 1_000_000
+                    #"""
+                    self.adjustSwitchValues(dlSlice1, dlSlice2, ulSlice1, ulSlice2)
 
-                            self.setLog(f"Set DL slice allocation; Time={epoch_ms_now}, Slice1={dlSlice1}, Slice2={dlSlice2}")
-                            self.setLog(f"Set UL slice allocation; Time={epoch_ms_now}, Slice1={ulSlice1}, Slice2={ulSlice2}")
-                            #"""
-                    except Exception as e:
-                        logger.warning(f"Recover from error in execute: {str(e)}")
+                    epoch_ms_now = time.time_ns() // 1_000_000
 
-                    time.sleep(self.config["updateIntervalSeconds"])
+                    self.setLog(f"Set DL slice allocation; Time={epoch_ms_now}, Slice1={dlSlice1}, Slice2={dlSlice2}")
+                    self.setLog(f"Set UL slice allocation; Time={epoch_ms_now}, Slice1={ulSlice1}, Slice2={ulSlice2}")
+                    #"""
+            except Exception as e:
+                logger.warning(f"Recover from error in execute: {str(e)}")
 
+            # Wait for the next update; the stop signal interrupts the wait immediately
+            if self._stop_event.wait(self.config["updateIntervalSeconds"]):
                 break
 
-            time.sleep(0.1)
-
     def cleanup(self):
         """
         Handle post-experiment processes (e.g., stopping Qosium and OSM).
@@ -185,9 +200,9 @@ class Experiment:
 
             with self.statusLock:
                 return {
-                    "id": self.id,
+                    "id": self._status[0],
                     "defaultSliceId": self.config["defaultSliceId"],
-                    "slices": copy.deepcopy(self.slices)
+                    "slices": [dict(item) for item in self.slices]
                 }
 
     def load(self, nst):
@@ -201,25 +216,22 @@ class Experiment:
             Exception: If the submitted NST contains invalid information.
         """
         with self.statusLock:
-            self.id = None
-            self.log = ""
-            self.state = self.STATE_READY
-            self.message = None
+            self._status = (None, self.STATE_READY, None)
             self.nst = None
             self.slices = []
             self.apps = []
 
+            with self.logLock:
+                self.log.clear()
+
             # Check the received NST
 
             if "trialId" not in nst or not isinstance(nst["trialId"], int):
                 raise Exception("Invalid or no trial ID in NST")
 
             # Start and stop times in NST are in the UTC timezone
-            dt = datetime.strptime(nst["startTime"], "%Y-%m-%dT%H:%M:%SZ")
-            self.startTime = dt.replace(tzinfo=timezone.utc)
-
-            dt = datetime.strptime(nst["stopTime"], "%Y-%m-%dT%H:%M:%SZ")
-            self.stopTime = dt.replace(tzinfo=timezone.utc)
+            self.startTime = self.parseTime(nst.get("startTime"))
+            self.stopTime = self.parseTime(nst.get("stopTime"))
 
             timeNow = datetime.now(timezone.utc)
 
@@ -229,8 +241,13 @@ class Experiment:
             if self.startTime > self.stopTime:
                 raise Exception("Invalid execution time in NST")
 
-            logger.debug(f"Experiment start time: {self.startTime} ({int(self.startTime.timestamp())})")
-            logger.debug(f"Experiment stop time: {self.stopTime} ({int(self.stopTime.timestamp())})")
+            # Convert the start and stop times to monotonic deadlines for the execution loop
+            monotonicNow = time.monotonic()
+            self._startDeadline = monotonicNow + (self.startTime - timeNow).total_seconds()
+            self._stopDeadline = monotonicNow + (self.stopTime - timeNow).total_seconds()
+
+            logger.debug("Experiment start time: %s (%d)", self.startTime, self.startTime.timestamp())
+            logger.debug("Experiment stop time: %s (%d)", self.stopTime, self.stopTime.timestamp())
 
             if "slices" not in nst or not isinstance(nst["slices"], list) or "" in nst["slices"]:
                 raise Exception("Invalid or no slice information in NST")
@@ -259,7 +276,28 @@ class Experiment:
             self.nst = nst
 
             # Only one experiment run at a time; use static ID
-            self.id = 1
+            self._status = (1, self.STATE_READY, None)
+
+    def parseTime(self, value):
+        """
+        Parse a UTC timestamp of the NST (e.g., "2025-01-31T12:00:00Z").
+
+        Args:
+            value (str): The timestamp string.
+
+        Raises:
+            Exception: If the value is not a valid UTC timestamp.
+
+        Returns:
+            datetime: The timestamp in the UTC timezone.
+        """
+        if not isinstance(value, str) or not value.endswith("Z"):
+            raise Exception("Invalid execution time in NST")
+
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise Exception("Invalid execution time in NST")
 
     def startThread(self):
         """
@@ -289,42 +327,48 @@ class Experiment:
             Exception: If the ID of the running experiment is not found.
         """
         with self.runningLock:
-            if self.id != id or self._thread is None:
+            if self._status[0] != id or self._thread is None:
                 raise Exception("Experiment not found!")
 
             # Signal the experiment thread to stop
             self._stop_event.set()
 
             # Wait the experiment thread to finish
-            self.join()
+            self.join(self.JOIN_TIMEOUT_SECONDS)
 
             # TODO: Replace with self.log
             log = self.getLog()
 
             # Clear all status variables
             with self.statusLock:
-                self.id = None
-                self.log = ""
-                self.state = self.STATE_READY
-                self.message = None
+                self._status = (None, self.STATE_READY, None)
                 self.nst = None
                 self.slices = []
                 self.apps = []
 
+            with self.logLock:
+                self.log.clear()
+
             self._thread = None
             return log
 
-    def join(self):
+    def join(self, timeout=None):
         """
         Join the running experiment thread.
 
+        Args:
+            timeout (float): Maximum time in seconds to wait, or None to wait forever.
+
         Raises:
-            Exception: If no joinable experiment thread is found.
+            Exception: If no joinable experiment thread is found or it does not finish in time.
         """
         if self._thread == None:
             raise Exception("No joinable experiment thread found!")
 
-        self._thread.join()
+        self._thread.join(timeout)
+
+        if self._thread.is_alive():
+            raise Exception("Experiment thread did not stop in time!")
 
     def adjustSwitchValues(self, dlSlice1, dlSlice2, ulSlice1, ulSlice2):
         """
@@ -358,7 +402,7 @@ class Experiment:
             }
         ]
 
-        logger.debug(f"Send rate/burst values to OvS: {ovsValues}")
+        logger.debug("Send rate/burst values to OvS: %s", ovsValues)
         self.ovs.setDownlinkUplinkValues(ovsValues)
 
     def getStatus(self):
@@ -368,8 +412,8 @@ class Experiment:
         Returns:
             dict: The ID, state identifier, and message of the running experiment.
         """
-        with self.statusLock:
-            return {"id": self.id, "state": self.state, "message": self.message}
+        id, state, message = self._status
+        return {"id": id, "state": state, "message": message}
 
     def setStatus(self, state, message):
         """
@@ -379,9 +423,7 @@ class Experiment:
             state (str): A state identifier.
             message (str): A string describing the current state.
         """
-        with self.statusLock:
-            self.state = state
-            self.message = message
+        self._status = (self._status[0], state, message)
 
     def setLog(self, str):
         """
@@ -390,13 +432,15 @@ class Experiment:
         Args:
             str (str): A string containing a single log entry.
         """
-        now = datetime.now()
+        now = time.time()
 
         # Create a timestamp string with milliseconds
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        milliseconds = int((now % 1) * 1000)
 
-        with self.statusLock:
-            self.log += f"{timestamp}: {str}\n"
+        # Collect the rows in a deque and join them only when the log is read
+        with self.logLock:
+            self.log.append(f"{timestamp}.{milliseconds:03d}: {str}\n")
 
     def getLog(self):
         """
@@ -405,5 +449,5 @@ class Experiment:
         Returns:
             str: All log rows.
         """
-        with self.statusLock:
-            return self.log
+        with self.logLock:
+            return "".join(self.log)
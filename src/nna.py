@@ -1,14 +1,10 @@
 from flask import Flask, Response, request, jsonify
 from flask_cors import cross_origin
 from experiment import Experiment
-import logging
+from utils import configureLogging
 import json
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+configureLogging()
 
 app = Flask(__name__)
 exp = Experiment()
@@ -1,14 +1,8 @@
-import requests
 import urllib3
 import logging
-import copy
 import time
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+from utils import *
 
 logger = logging.getLogger("osm")
 
@@ -26,6 +20,13 @@ class Osm:
         """
         self.config = config
         self.apps = []
+        self.session = createSession()
+
+    def close(self):
+        """
+        Close the HTTP session and release all pooled connections.
+        """
+        self.session.close()
 
     def startVms(self):
         """
@@ -34,9 +35,9 @@ class Osm:
         Raises:
             Exception: If starting the VMs fails.
         """
-        resp = requests.post(f"{self.config["osmBaseUrl"]}/osm_create", json={
+        resp = self.session.post(f"{self.config["osmBaseUrl"]}/osm_create", json={
             "applications": self.apps
-        })
+        }, timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Starting VMs failed; StatusCode={resp.status_code}")
@@ -44,7 +45,7 @@ class Osm:
 
         respJson = resp.json()
 
-        logger.debug(f"VMs started; VMData={respJson}")
+        logger.debug("VMs started; VMData=%s", respJson)
 
     def stopRunningVms(self):
         """
@@ -53,7 +54,7 @@ class Osm:
         Raises:
             Exception: If retrieving or stopping any running VMs fails.
         """
-        resp = requests.get(f"{self.config["osmBaseUrl"]}/osm_info")
+        resp = self.session.get(f"{self.config["osmBaseUrl"]}/osm_info", timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Retrieving all running VMs failed; StatusCode={resp.status_code}")
@@ -65,7 +66,7 @@ class Osm:
             logger.debug("No running VMs found")
             return
 
-        resp = requests.delete(f"{self.config["osmBaseUrl"]}/osm_delete")
+        resp = self.session.delete(f"{self.config["osmBaseUrl"]}/osm_delete", timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Failed to stop VMs; StatusCode={resp.status_code}")
@@ -81,8 +82,8 @@ class Osm:
         Raises:
             Exception: If starting the VMs fails.
         """
-        # Deep copy as we extend the dictionary in this object
-        self.apps = copy.deepcopy(apps)
+        # Shallow copy is enough as the application names are strings
+        self.apps = list(apps)
 
         logger.debug("Initializing OSM: Stopping all running VMs")
 
@@ -107,6 +108,8 @@ class Osm:
 
 # For testing purposes
 if __name__ == "__main__":
+    configureLogging()
+
     osm = Osm({
         "osmBaseUrl": "http://10.50.150.103:5001"
     })
@@ -1,22 +1,32 @@
+import codecs
+import orjson
 import json
 import socket
 import logging
 import time
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+from utils import *
 
 logger = logging.getLogger("ovs")
 
+class OvsRpcError(Exception):
+    """Exception raised when an RPC request to OvS fails."""
+
 class Ovs:
     """Class for communicating with Open vSwitch using RPC messages."""
 
     INGRESS_POLICING_RATE = "ingress_policing_rate"
     INGRESS_POLICING_BURST = "ingress_policing_burst"
 
+    # Timeout (in seconds) for connecting to OvS and waiting for its response
+    SOCKET_TIMEOUT = 10
+
+    # Size (in bytes) of the buffer for receiving data from OvS
+    RECEIVE_BUFFER_SIZE = 65536
+
+    # Size (in bytes) of the kernel send and receive buffers of the OvS socket
+    SOCKET_BUFFER_SIZE = 65536
+
     def __init__(self, config):
         """
         Initialize an Ovs instance.
@@ -25,6 +35,132 @@ class Ovs:
             config (dict): The main configuration.
         """
         self.config = config
+        self._sock = None
+        self._decoder = json.JSONDecoder()
+        self._receiveBuffer = bytearray(self.RECEIVE_BUFFER_SIZE)
+        self._utf8Decoder = None
+        self._pending = ""
+
+        # The (rate, burst) last applied to each interface, keyed by interface name
+        self._lastApplied = {}
+
+        # The configured interfaces do not change, so construct their update operations only once
+        self._updateOperations = {}
+
+        for slice in self.config["slices"]:
+            for interface in (slice["downlinkOvsInterface"], slice["uplinkOvsInterface"]):
+                self._updateOperations[interface] = self.getUpdateOperation(interface, 0, 0)
+
+    def forceNextUpdate(self):
+        """
+        Forget the values last applied to the interfaces, so that the next update
+        sends all values to OvS even if they have not changed.
+        """
+        self._lastApplied.clear()
+
+    def getSocket(self, host, port):
+        """
+        Return the TCP connection to OvS, connecting first if not connected.
+
+        Args:
+            host (str): The host name or IP address of OvS.
+            port (int): The port on which OvS is listening.
+
+        Returns:
+            socket.socket: The connected socket.
+        """
+        if self._sock == None:
+            self._sock = socket.create_connection((host, port), timeout=self.SOCKET_TIMEOUT)
+
+            # Send small RPC messages immediately instead of waiting to coalesce them (Nagle)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            # Fit a batched transaction and its response into the socket buffers
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.SOCKET_BUFFER_SIZE)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_BUFFER_SIZE)
+
+            # Received data not yet consumed is kept per connection
+            self._utf8Decoder = codecs.getincrementaldecoder("utf-8")()
+            self._pending = ""
+
+        return self._sock
+
+    def close(self):
+        """
+        Close the TCP connection to OvS (if any).
+        """
+        if self._sock != None:
+            self._sock.close()
+            self._sock = None
+
+    def receiveJsonRpcResponse(self, sock):
+        """
+        Read JSON-RPC messages from OvS until the response to a request is received.
+        Echo requests (inactivity probes) sent by OvS are answered while waiting.
+
+        Args:
+            sock (socket.socket): The connected socket.
+
+        Raises:
+            OvsRpcError: If the connection is closed before a response is received.
+
+        Returns:
+            dict: The RPC response from OvS.
+        """
+        receiveView = memoryview(self._receiveBuffer)
+
+        while True:
+            # OvS does not delimit JSON-RPC messages, so decode complete messages from the
+            # received data and keep any remainder for the next message
+            while self._pending:
+                try:
+                    message, end = self._decoder.raw_decode(self._pending)
+                except json.JSONDecodeError:
+                    # The message is not complete yet
+                    break
+
+                self._pending = self._pending[end:].lstrip()
+
+                if not isinstance(message, dict):
+                    raise OvsRpcError(f"Invalid message from OvS: {message!r}")
+
+                if "method" not in message:
+                    return message
+
+                if message["method"] == "echo":
+                    reply = {"id": message["id"], "result": message["params"], "error": None}
+                    sock.sendall(orjson.dumps(reply))
+
+            size = sock.recv_into(receiveView)
+
+            if size == 0:
+                raise OvsRpcError("Connection closed by OvS")
+
+            self._pending = (self._pending + self._utf8Decoder.decode(receiveView[:size])).lstrip()
+
+    def getUpdateOperation(self, interface, rate, burst):
+        """
+        Construct and return a transaction operation to set the policing rate and burst.
+
+        Args:
+            interface (str): The name of the OvS interface to use.
+            rate (int): The ingress policing rate.
+            burst (int): The ingress policing burst.
+
+        Returns:
+            dict: The constructed update operation.
+        """
+        return {
+            "op": "update",
+            "table": "Interface",
+            "where": [
+                ["name", "==", interface]
+            ],
+            "row": {
+                self.INGRESS_POLICING_RATE: rate,
+                self.INGRESS_POLICING_BURST: burst
+            }
+        }
 
     def getJsonRpcRequest(self, interface, rate, burst):
         """
@@ -38,27 +174,44 @@ class Ovs:
         Returns:
             dict: The constructed RPC message.
         """
+        return self.getBatchedJsonRpcRequest([(interface, rate, burst)])
+
+    def getBatchedJsonRpcRequest(self, updates):
+        """
+        Construct and return an RPC message to set the policing rate and burst
+        of several interfaces in a single transaction.
+
+        The operations of configured interfaces are reused between calls, so the
+        returned message is valid only until the next call.
+
+        Args:
+            updates (list): The (interface, rate, burst) tuples to set.
+
+        Returns:
+            dict: The constructed RPC message.
+        """
+        operations = []
+
+        for interface, rate, burst in updates:
+            operation = self._updateOperations.get(interface)
+
+            if operation == None:
+                operation = self.getUpdateOperation(interface, rate, burst)
+            else:
+                operation["row"][self.INGRESS_POLICING_RATE] = rate
+                operation["row"][self.INGRESS_POLICING_BURST] = burst
+
+            operations.append(operation)
+
         return {
             "id": 1,
             "method": "transact",
-            "params": [
-                "Open_vSwitch", {
-                    "op": "update",
-                    "table": "Interface",
-                    "where": [
-                        ["name", "==", interface]
-                    ],
-                    "row": {
-                        self.INGRESS_POLICING_RATE: rate,
-                        self.INGRESS_POLICING_BURST: burst
-                    }
-                }
-            ]
+            "params": ["Open_vSwitch", *operations]
         }
 
     def sendJsonRpcRequest(self, host, port, request):
         """
-        Send an RPC message to OvS via a TCP socket.
+        Send an RPC message to OvS via a TCP socket kept open between requests.
 
         Args:
             host (str): The host name or IP address of OvS.
@@ -66,23 +219,35 @@ class Ovs:
             request (dict): The RPC message to send.
 
         Raises:
-            Exception: If sending the RPC message fails.
+            OvsRpcError: If sending the RPC message or receiving the response fails.
 
         Returns:
             dict: The RPC response from OvS.
         """
-        logger.debug(f"Sending request to OvS: {request}")
-        response = None
+        logger.debug("Sending request to OvS: %s", request)
 
-        try:
-            sock = socket.create_connection((host, port))
-            sock.sendall(json.dumps(request).encode() + b"\n")
-            response = sock.recv(4096)
-            sock.close()
-        except Exception as e:
-            raise Exception(f"Error sending request to OvS: {str(e)}")
+        # OvS may have closed a kept-alive connection; retry once on a new connection
+        retry = self._sock != None
+
+        while True:
+            try:
+                sock = self.getSocket(host, port)
+                sock.sendall(orjson.dumps(request, option=orjson.OPT_APPEND_NEWLINE))
+                return self.receiveJsonRpcResponse(sock)
+            except Exception as e:
+                # Include any received but unparsable data in the error
+                pending = self._pending
 
-        return json.loads(response.decode())
+                # Drop the connection so that it is not reused in an unknown state
+                self.close()
+
+                if not retry:
+                    if pending:
+                        raise OvsRpcError(f"Error sending request to OvS: {str(e)}; Received={pending!r}")
+
+                    raise OvsRpcError(f"Error sending request to OvS: {str(e)}")
+
+                retry = False
 
     def setInterfaceValues(self, interfaceName, rate, burst):
         """
@@ -94,7 +259,8 @@ class Ovs:
             burst (int): The ingress policing burst to set.
 
         Raises:
-            Exception: If setting the rate or burst value on OvS fails.
+            OvsRpcError: If setting the rate or burst value on OvS fails.
+            ExceptionGroup: If OvS rejects the update operation.
         """
         request = self.getJsonRpcRequest(
             interfaceName, rate, burst)
@@ -105,38 +271,107 @@ class Ovs:
             request
         )
 
-        logger.debug(f"OvS response: {response}")
+        self.checkJsonRpcResponse(response, [f"interface '{interfaceName}'"])
+
+        self._lastApplied[interfaceName] = (rate, burst)
+
+    def checkJsonRpcResponse(self, response, targets):
+        """
+        Check a transaction response from OvS for errors.
+
+        Args:
+            response (dict): The RPC response from OvS.
+            targets (list): Descriptions of the updated targets in operation order (used in errors).
+
+        Raises:
+            OvsRpcError: If the transaction failed or the response has no result list.
+            ExceptionGroup: An OvsRpcError for each failed operation of the transaction.
+        """
+        logger.debug("OvS response: %s", response)
+
+        error = response.get("error")
 
-        if response["error"] != None:
-            raise Exception(f"Error setting rate/burst value: {response["error"] }")
+        if error != None:
+            raise OvsRpcError(f"Error setting rate/burst value: {error}")
+
+        results = response.get("result")
+
+        if not isinstance(results, list):
+            raise OvsRpcError(f"Invalid response to rate/burst update: {response}")
+
+        errors = []
+
+        # Operations after a failed one are not executed and have a null result;
+        # an extra result after the operations reports a failed commit
+        for index, result in enumerate(results):
+            if result != None and "error" in result:
+                target = targets[index] if index < len(targets) else "transaction commit"
+                details = f" ({result["details"]})" if "details" in result else ""
+                errors.append(OvsRpcError(f"Error setting rate/burst value for {target}: {result["error"]}{details}"))
+
+        if errors:
+            # The transaction is aborted as a whole, so none of the values were applied
+            raise ExceptionGroup(f"OvS update failed: {"; ".join(str(e) for e in errors)}", errors)
 
     def setDownlinkUplinkValues(self, allocation):
         """
         Set the DL/UL rate and burst values for each configured slice.
+        Values that are unchanged since the last update are not sent to OvS.
 
         Args:
             allocation (dict): Slice-specific allocation from AI.
 
         Raises:
-            Exception: If setting the rate or burst values on OvS fails.
+            OvsRpcError: If setting the rate or burst values on OvS fails.
+            ExceptionGroup: If OvS rejects any of the update operations.
         """
+        updates = []
+        targets = []
+
         for index, slice in enumerate(self.config["slices"]):
             dlRate = allocation[index]["dl"]["rate"]
             dlBurst = allocation[index]["dl"]["burst"]
             interface = slice["downlinkOvsInterface"]
 
-            logger.debug(f"Setting DL rate/burst for slice '{slice["id"]}': {dlRate}/{dlBurst} ({interface})")
-            self.setInterfaceValues(interface, dlRate, dlBurst)
+            if self._lastApplied.get(interface) != (dlRate, dlBurst):
+                logger.debug("Setting DL rate/burst for slice '%s': %s/%s (%s)", slice["id"], dlRate, dlBurst, interface)
+                updates.append((interface, dlRate, dlBurst))
+                targets.append(f"slice '{slice["id"]}' DL ({interface})")
 
             ulRate = allocation[index]["ul"]["rate"]
             ulBurst = allocation[index]["ul"]["burst"]
             interface = slice["uplinkOvsInterface"]
 
-            logger.debug(f"Setting UL rate/burst for slice '{slice["id"]}': {ulRate}/{ulBurst} ({interface})")
-            self.setInterfaceValues(interface, ulRate, ulBurst)
+            if self._lastApplied.get(interface) != (ulRate, ulBurst):
+                logger.debug("Setting UL rate/burst for slice '%s': %s/%s (%s)", slice["id"], ulRate, ulBurst, interface)
+                updates.append((interface, ulRate, ulBurst))
+                targets.append(f"slice '{slice["id"]}' UL ({interface})")
+
+        if not updates:
+            logger.debug("Rate/burst values unchanged; skipping OvS update")
+            return
+
+        try:
+            # Update all changed interfaces in a single transaction
+            response = self.sendJsonRpcRequest(
+                self.config["ovsHostName"],
+                self.config["ovsHostPort"],
+                self.getBatchedJsonRpcRequest(updates)
+            )
+
+            self.checkJsonRpcResponse(response, targets)
+        except Exception:
+            # The state of the interfaces is unknown after a failure
+            self.forceNextUpdate()
+            raise
+
+        for interface, rate, burst in updates:
+            self._lastApplied[interface] = (rate, burst)
 
 # For testing purposes
 if __name__ == "__main__":
+    configureLogging()
+
     ovs = Ovs({
         "slices": [
             {
@@ -164,3 +399,4 @@ if __name__ == "__main__":
         {"dl": {"rate": 0, "burst": 0}, "ul": {"rate": 0, "burst": 0}},
         {"dl": {"rate": 0, "burst": 0}, "ul": {"rate": 0, "burst": 0}}
     ])
+    ovs.close()
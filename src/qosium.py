@@ -1,19 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import requests
 import urllib3
 import logging
-import json
-import copy
+import orjson
 import time
 
 from utils import *
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-
 logger = logging.getLogger("qosium")
 
 currentDir = Path(__file__).parent
@@ -26,6 +19,9 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class Qosium:
     """Class for communicating with Qosium Storage via a REST API."""
 
+    # The maximum number of concurrent REST API calls to Qosium Storage
+    MAX_CONCURRENT_REQUESTS = 8
+
     def __init__(self, config):
         """
         Initialize a Qosium instance.
@@ -36,6 +32,31 @@ class Qosium:
         self.config = config
         self.slices = []
 
+        # Keep one connection to the single Qosium Storage host per concurrent call
+        self.session = createSession(poolConnections=1, poolMaxSize=self.MAX_CONCURRENT_REQUESTS)
+
+        # The REST API endpoint URLs do not change, so construct them only once
+        baseUrl = self.config["qosiumBaseUrl"]
+        self._urlStart = f"{baseUrl}/measurement/start"
+        self._urlStatusAll = f"{baseUrl}/measurement/status/all"
+        self._urlStop = f"{baseUrl}/measurement/stop?QSMeasId={{}}"
+        self._urlLatestResult = f"{baseUrl}/AverageResult?qmId={{}}&limit=1&sort=desc"
+
+        # The latest (time, KPIs) of each measurement, keyed by measurement ID
+        self._latestKpis = {}
+
+        # Parse the slice-specific measurement parameter templates only once
+        self._measTemplates = [readJson(path) for path in sliceConfFiles]
+
+        # Worker threads for calling the REST API concurrently (e.g., querying all slices)
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS)
+
+    def close(self):
+        """
+        Close the HTTP session and release all pooled connections.
+        """
+        self.session.close()
+
     def startMeasurement(self, sliceId, measParams):
         """
         Start a Qosium measurement according to the slice-specific configuration.
@@ -50,15 +71,15 @@ class Qosium:
         Returns:
             str: The identifier of the measurement created in Qosium Storage.
         """
-        logger.debug(f"Starting measurement; SliceId={sliceId}")
+        logger.debug("Starting measurement; SliceId=%s", sliceId)
 
-        resp = requests.post(f"{self.config["qosiumBaseUrl"]}/measurement/start", json=measParams)
+        resp = self.session.post(self._urlStart, data=orjson.dumps(measParams), headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Starting measurement failed; StatusCode={resp.status_code}")
             raise Exception(f"Starting measurement for slice '{sliceId}' failed!")
 
-        respJson = resp.json()
+        respJson = orjson.loads(resp.content)
 
         internalName = None
 
@@ -69,7 +90,7 @@ class Qosium:
             logger.error(f"Starting measurement failed; InternalName={internalName}")
             raise Exception(f"Starting measurement for slice '{sliceId}' failed!")
 
-        logger.info(f"Measurement started; QSMeasId={respJson["QSMeasId"]}, InternalName={internalName}")
+        logger.info("Measurement started; QSMeasId=%s, InternalName=%s", respJson["QSMeasId"], internalName)
 
         return respJson["QSMeasId"]
 
@@ -80,13 +101,15 @@ class Qosium:
         Raises:
             Exception: If retrieving or stopping any running measurements fails.
         """
-        resp = requests.get(f"{self.config["qosiumBaseUrl"]}/measurement/status/all")
+        resp = self.session.get(self._urlStatusAll, timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Retrieving all running measurements failed; StatusCode={resp.status_code}")
             raise Exception("Error retrieving all running measurements!")
 
-        respJson = resp.json()
+        respJson = orjson.loads(resp.content)
+
+        qsMeasIds = []
 
         for item in respJson:
             if "QSMeasId" not in item:
@@ -99,11 +122,26 @@ class Qosium:
                 logger.warning("Encountered a null measurement ID in running measurements")
                 continue
 
-            resp = requests.get(f"{self.config["qosiumBaseUrl"]}/measurement/stop?QSMeasId={qsMeasId}")
+            qsMeasIds.append(qsMeasId)
+
+        # Stop all measurements concurrently
+        list(self._executor.map(self.stopMeasurement, qsMeasIds))
+
+    def stopMeasurement(self, qsMeasId):
+        """
+        Stop a running measurement in Qosium Storage.
+
+        Args:
+            qsMeasId (str): The identifier of the running measurement.
+
+        Raises:
+            Exception: If sending the stop request fails.
+        """
+        resp = self.session.get(self._urlStop.format(qsMeasId), timeout=REQUEST_TIMEOUT)
 
-            if resp.status_code != 200:
-                # XXX: Ignore possible error code because of a bug in Qosium REST API
-                logger.warning(f"Failed to stop measurement; StatusCode={resp.status_code}, QSMeasId={qsMeasId}")
+        if resp.status_code != 200:
+            # XXX: Ignore possible error code because of a bug in Qosium REST API
+            logger.warning(f"Failed to stop measurement; StatusCode={resp.status_code}, QSMeasId={qsMeasId}")
 
     def getLatestKpis(self, qsMeasId):
         """
@@ -118,21 +156,28 @@ class Qosium:
         Returns:
             dict: The DL/UL KPIs (throughput, latency, jitter, packet loss ratio) of the measurement.
         """
-        logger.debug(f"Getting the latest measurement result; QsMeasId={qsMeasId}")
+        logger.debug("Getting the latest measurement result; QsMeasId=%s", qsMeasId)
 
-        resp = requests.get(f"{self.config["qosiumBaseUrl"]}/AverageResult?qmId={qsMeasId}&limit=1&sort=desc")
+        resp = self.session.get(self._urlLatestResult.format(qsMeasId), timeout=REQUEST_TIMEOUT)
 
         if resp.status_code != 200:
             logger.error(f"Failed to get the latest measurement result; QsMeasId={qsMeasId}, StatusCode={resp.status_code}")
             raise Exception("Failed to get the latest KPIs")
 
-        respJson = resp.json()
+        respJson = orjson.loads(resp.content)
 
         # Result set is empty or invalid
         if len(respJson) != 1:
             logger.error(f"Measurement result set invalid; QsMeasId={qsMeasId}")
             raise Exception("Invalid measurement set encountered")
 
+        # Reuse the previous KPIs if no new result has arrived since the last query
+        latest = self._latestKpis.get(qsMeasId)
+
+        if latest != None and latest[0] == respJson[0]["time"]:
+            logger.debug("No new measurement result; QsMeasId=%s", qsMeasId)
+            return latest[1]
+
         retval = {
             "time": respJson[0]["time"],
             "downlink": {
@@ -151,7 +196,9 @@ class Qosium:
             }
         }
 
-        logger.debug(f"Got DL/UL KPIs: {retval}")
+        logger.debug("Got DL/UL KPIs: %s", retval)
+
+        self._latestKpis[qsMeasId] = (retval["time"], retval)
 
         return retval
 
@@ -165,8 +212,9 @@ class Qosium:
         Raises:
             Exception: If stopping or starting Qosium measurements fails.
         """
-        # Deep copy as we extend the dictionary in this object
-        self.slices = copy.deepcopy(slices)
+        # Copy the slice dictionaries as we extend them in this object
+        self.slices = [dict(item) for item in slices]
+        self._latestKpis.clear()
 
         logger.debug("Initializing Qosium: Stopping all running measurements")
 
@@ -176,19 +224,29 @@ class Qosium:
 
         if not self.slices:
             # No slices defined; use the default slice ID and UE #1
-            measParams = json.loads(readFileContents(sliceConfFiles[0]))
+            # Shallow copy is enough as the template values are strings
+            measParams = dict(self._measTemplates[0])
             measParams["measurement_description"] = f"SliceId={self.config["defaultSliceId"]}"
 
             logger.debug("No slices defined; use default slice ID")
 
             self.startMeasurement(self.config["defaultSliceId"], measParams)
 
+        sliceIds = []
+        sliceMeasParams = []
+
         for index, item in enumerate(self.slices):
-            measParams = json.loads(readFileContents(sliceConfFiles[index]))
+            measParams = dict(self._measTemplates[index])
             measParams["measurement_description"] = f"SliceId={item["id"]}"
 
-            # Start measurement and store measurement ID in the internal slices variable
-            self.slices[index]["qsMeasId"] = self.startMeasurement(item["id"], measParams)
+            sliceIds.append(item["id"])
+            sliceMeasParams.append(measParams)
+
+        # Start all measurements concurrently and store measurement IDs in the internal slices variable
+        qsMeasIds = self._executor.map(self.startMeasurement, sliceIds, sliceMeasParams)
+
+        for item, qsMeasId in zip(self.slices, qsMeasIds):
+            item["qsMeasId"] = qsMeasId
 
         logger.debug("Initializing Qosium: Done")
 
@@ -213,15 +271,13 @@ class Qosium:
         Returns:
             list: The measured KPIs for each slice.
         """
-        kpis = []
-
-        for item in self.slices:
-            kpis.append(self.getLatestKpis(item["qsMeasId"]))
-
-        return kpis
+        # Query all slices concurrently; results are returned in slice order
+        return list(self._executor.map(self.getLatestKpis, [item["qsMeasId"] for item in self.slices]))
 
 # For testing purposes
 if __name__ == "__main__":
+    configureLogging()
+
     qosium = Qosium({
         "defaultSliceId": "b84725bc-955a-44bb-9327-21c9d7eb5f65",
         "qosiumBaseUrl": "http://172.29.12.66:8080"
@@ -1,3 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from pathlib import Path
+import requests
+import logging
+import orjson
+
+# Connect and read timeouts (in seconds) for all REST API calls
+REQUEST_TIMEOUT = (3, 10)
+
+# Headers for REST API requests with a pre-serialized JSON body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Burst per policing rate unit: 1.5 seconds of traffic, converted from bits to bytes (1.5 / 8)
+BURST_FACTOR = 0.1875
+
+def configureLogging():
+    """
+    Configure the root logger of the process. Call only from entry points.
+    """
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s.%(msecs)03d %(levelname)s %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
 def readFileContents(path):
     """
     Open a file and return its contents.
@@ -11,6 +38,67 @@ def readFileContents(path):
     with open(path, "r") as file:
         return file.read()
 
+def readJson(path):
+    """
+    Open a JSON file and return its parsed contents.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        Any: The parsed contents of the file.
+    """
+    return orjson.loads(Path(path).read_bytes())
+
+def createSession(poolConnections=4, poolMaxSize=8):
+    """
+    Create an HTTP session with a connection pool for reusing keep-alive connections.
+
+    Args:
+        poolConnections (int): The number of connection pools to cache.
+        poolMaxSize (int): The maximum number of connections to keep in a pool.
+
+    Returns:
+        requests.Session: The created HTTP session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=poolConnections,
+        pool_maxsize=poolMaxSize,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def runConcurrently(func, items):
+    """
+    Call a function for each item in its own worker thread and wait for all calls to finish.
+
+    Args:
+        func (callable): The function to call with each item.
+        items (list): The items to pass to the function.
+
+    Raises:
+        Exception: The first exception raised by any of the calls.
+
+    Returns:
+        list: The return values of the calls in item order.
+    """
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(items)) as executor:
+        futures = [executor.submit(func, item) for item in items]
+
+        # Let all calls finish before raising so no request is left in flight
+        errors = [future.exception() for future in as_completed(futures) if future.exception() != None]
+
+    if errors:
+        raise errors[0]
+
+    return [future.result() for future in futures]
+
 def calculateBurst(rate):
     """
     Calculate the burst value based on a rate value.
@@ -22,4 +110,4 @@ def calculateBurst(rate):
     Returns:
         int: The calculated policing burst value.
     """
-    return round((rate / 8) * 1.5)
+    return round(rate * BURST_FACTOR)